@@ -0,0 +1,67 @@
+import time
+import tracemalloc
+
+from syntax_analyzer import Lexer, MetricsListener, Parser, TreeBuilder, process_declarations
+
+BODY = "x as 10;\ny as x plus 2 mult y;\nwhile y LT x do y as y plus 1;\nif x LT y then write(x, y); else read(x);\n"
+
+
+def make_program(repeat):
+    return f"program var\nx, y : integer;\nbegin\n{BODY * repeat}end.\n"
+
+
+# Время получения таблицы символов: только раздел объявлений против полного разбора
+def benchmark_declarations(repeat=3000):
+    program = make_program(repeat)
+    started = time.perf_counter()
+    lexer = Lexer(program)
+    Parser(lexer.tokenize(), program, lexer.positions).parse_program()
+    full = time.perf_counter() - started
+    started = time.perf_counter()
+    process_declarations(program)
+    declarations = time.perf_counter() - started
+    print(f"{len(lexer.tokens)} токенов: полный разбор {full * 1000:.1f} мс, "
+          f"только объявления {declarations * 1000:.1f} мс")
+
+
+# Время разбора длинных сгенерированных выражений (должно расти линейно)
+def benchmark_expression(sizes=(1000, 10000, 50000)):
+    operands = ["x", "10", "(y mult 2D)", "1.5", "101B", "17O", "1FH"]
+    operators = ["plus", "mult", "min", "div"]
+    for size in sizes:
+        parts = [operands[0]]
+        for i in range(1, size):
+            parts.append(operators[i % len(operators)])
+            parts.append(operands[i % len(operands)])
+        expression = " ".join(parts)
+        program = f"program var\nx, y : integer;\nv : boolean;\nbegin\nwrite((({expression}) GE 0) or ~v);\nend.\n"
+        tokens = Lexer(program).tokenize()
+        parser = Parser(tokens, program)
+        started = time.perf_counter()
+        parser.parse_program()
+        elapsed = time.perf_counter() - started
+        assert not parser.has_errors
+        print(f"{size:>8} операндов: {elapsed * 1000:.2f} мс, {elapsed * 1e6 / size:.2f} мкс на операнд")
+
+
+# Пиковая память всего конвейера (лексер + парсер). Список токенов и их смещений хранится целиком,
+# поэтому память растет с размером программы; слушатель событий лишь не добавляет к ней дерево разбора
+def benchmark_listeners(repeats=(500, 2000)):
+    for repeat in repeats:
+        program = make_program(repeat)
+        results = []
+        for listener in [None, MetricsListener(), TreeBuilder()]:
+            tracemalloc.start()
+            lexer = Lexer(program)
+            tokens = lexer.tokenize()
+            Parser(tokens, program, lexer.positions, [listener] if listener else None).parse_program()
+            results.append(tracemalloc.get_traced_memory()[1] / 1024)
+            tracemalloc.stop()
+        print(f"{len(tokens)} токенов: без слушателей {results[0]:.0f} КБ, "
+              f"MetricsListener {results[1]:.0f} КБ, TreeBuilder {results[2]:.0f} КБ")
+
+
+if __name__ == "__main__":
+    benchmark_declarations()
+    benchmark_expression()
+    benchmark_listeners()
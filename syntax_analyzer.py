@@ -1,3 +1,4 @@
+import functools
 import re
 
 # Определение типов токенов
@@ -20,6 +21,16 @@ TOKENS = [
     ('UNKNOWN', r'.'),  # неизвестные символы
 ]
 
+# Все шаблоны в одном регулярном выражении, компилируется один раз.
+# Альтернативы проверяются в порядке TOKENS, поэтому побеждает первый подходящий тип, как и раньше
+TOKEN_REGEX = re.compile('|'.join(f'(?P<{token_type}>{regex})' for token_type, regex in TOKENS), re.DOTALL)
+
+# Быстрый просмотр тела программы без лексического анализа: комментарии, скобки [ ], ';', else и end
+SKIM_REGEX = re.compile(r'\{[^}]*?\}|[\[\];]|\b(?:else|end)\b', re.DOTALL)
+PROGRAM_END_REGEX = re.compile(r'\s*\.')
+SPACE_REGEX = re.compile(r'\s*')
+SKIP_REGEX = re.compile(r'(?:\s+|\{[^}]*?\})*', re.DOTALL)
+
 
 class Lexer:
     def __init__(self, code):
@@ -29,49 +40,53 @@ class Lexer:
         self.variables = set()
         self.in_var_section = False
         self.has_error = False  # Флаг ошибок
+        self.positions = []  # Смещение начала каждого токена в исходном коде
 
-    def tokenize(self):
+    # stop_at_begin: остановиться после begin (тело программы не разбирается на токены)
+    def tokenize(self, stop_at_begin=False):
         while self.pos < len(self.code):
-            match = None
-            for token_type, regex in TOKENS:
-                pattern = re.compile(regex, re.DOTALL)
-                match = pattern.match(self.code, self.pos)
-                if match:
-                    text = match.group(0)
-                    if token_type == 'WHITESPACE':
-                        # Пропускаем пробелы
-                        pass
-                    elif token_type == 'KEYWORD' and text == 'var':
-                        # Начинаем раздел объявлений переменных
-                        self.in_var_section = True
-                        self.tokens.append((token_type, text))
-                    elif token_type == 'KEYWORD' and text in ['begin', 'end']:
-                        # Конец раздела объявлений переменных
-                        if text == 'begin':
-                            self.in_var_section = False
-                        self.tokens.append((token_type, text))
-                    elif token_type == 'REAL':
-                        float_value = float(match.group(0))
-                        self.tokens.append((token_type, str(float_value)))
-                    elif token_type == 'ID':
-                        if self.in_var_section:
-                            # Добавляем переменные в таблицу символов, если они находятся в разделе var
-                            self.variables.add(text)
-                            self.tokens.append((token_type, text))
-                        elif text in self.variables:
-                            # Если переменная была объявлена ранее, добавляем её
-                            self.tokens.append((token_type, text))
-                        else:
-                            # Если переменная не была объявлена, выдаём ошибку
-                            print(f"Ошибка: Переменная '{text}' использована без объявления.")
-                            self.has_error = True  # Устанавливаем флаг ошибок
-                            self.tokens.append(('UNKNOWN', text))
-                    elif token_type != 'WHITESPACE':  # Пропускаем пробелы
-                        self.tokens.append((token_type, text))
-                    self.pos = match.end(0)
-                    break
+            match = TOKEN_REGEX.match(self.code, self.pos)
             if not match:
                 raise ValueError(f"Нераспознанный символ: {self.code[self.pos]}")
+            token_type = match.lastgroup
+            text = match.group(0)
+            if token_type == 'WHITESPACE':
+                # Пропускаем пробелы
+                pass
+            elif token_type == 'KEYWORD' and text == 'var':
+                # Начинаем раздел объявлений переменных
+                self.in_var_section = True
+                self.tokens.append((token_type, text))
+            elif token_type == 'KEYWORD' and text in ['begin', 'end']:
+                # Конец раздела объявлений переменных
+                if text == 'begin':
+                    self.in_var_section = False
+                self.tokens.append((token_type, text))
+                if text == 'begin' and stop_at_begin:
+                    self.positions.append(match.start(0))
+                    self.pos = match.end(0)
+                    break
+            elif token_type == 'REAL':
+                float_value = float(match.group(0))
+                self.tokens.append((token_type, str(float_value)))
+            elif token_type == 'ID':
+                if self.in_var_section:
+                    # Добавляем переменные в таблицу символов, если они находятся в разделе var
+                    self.variables.add(text)
+                    self.tokens.append((token_type, text))
+                elif text in self.variables:
+                    # Если переменная была объявлена ранее, добавляем её
+                    self.tokens.append((token_type, text))
+                else:
+                    # Если переменная не была объявлена, выдаём ошибку
+                    print(f"Ошибка: Переменная '{text}' использована без объявления.")
+                    self.has_error = True  # Устанавливаем флаг ошибок
+                    self.tokens.append(('UNKNOWN', text))
+            else:
+                self.tokens.append((token_type, text))
+            if len(self.positions) < len(self.tokens):
+                self.positions.append(match.start(0))
+            self.pos = match.end(0)
         return self.tokens
 
     def get_line_number(self):
@@ -91,17 +106,105 @@ class SyntaxError(Exception):
         self.line_text = line_text
 
 
+# Приоритеты бинарных операций: чем больше значение, тем сильнее связывание
+BINDING_POWER = {
+    "OP_REL": 1,
+    "OP_ADD": 2,
+    "OP_MUL": 3,
+}
+UNARY_BINDING_POWER = 4  # Унарная операция ~ связывает сильнее любой бинарной
+
+# Типы констант, которые могут быть операндом выражения (тип ID берется из таблицы символов)
+OPERAND_TYPES = {
+    "INTEGER": "integer",
+    "BIN": "integer",
+    "OCT": "integer",
+    "HEX": "integer",
+    "REAL": "real",
+    "BOOLEAN": "boolean",
+}
+NUMERIC_TYPES = ["integer", "real"]
+
+
+# Слушатель событий разбора (SAX-стиль): дерево не строится, события приходят во время разбора.
+# start и end - индексы токенов (смещение в символах: Lexer.positions[start])
+class ParseListener:
+    def enter(self, kind, start):
+        pass
+
+    def exit(self, kind, start, end):
+        pass
+
+
+# Метрики программы без построения дерева: число конструкций каждого вида и глубина вложенности
+class MetricsListener(ParseListener):
+    def __init__(self):
+        self.counts = {}
+        self.depth = 0
+        self.max_depth = 0
+
+    def enter(self, kind, start):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self.depth += 1
+        if self.depth > self.max_depth:
+            self.max_depth = self.depth
+
+    def exit(self, kind, start, end):
+        self.depth -= 1
+
+
+# Построение полного дерева разбора по событиям: узел [вид, start, end, дочерние узлы]
+class TreeBuilder(ParseListener):
+    def __init__(self):
+        self.root = None
+        self.stack = []
+
+    def enter(self, kind, start):
+        node = [kind, start, None, []]
+        if self.stack:
+            self.stack[-1][3].append(node)
+        else:
+            self.root = node
+        self.stack.append(node)
+
+    def exit(self, kind, start, end):
+        self.stack.pop()[2] = end
+
+
+# Рассылка событий enter/exit слушателям парсера вокруг метода parse_*.
+# exit отправляется и при синтаксической ошибке, поэтому события всегда правильно вложены
+def emits(kind):
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not self.listeners:
+                return method(self, *args, **kwargs)
+            start = self.current_token_index
+            for listener in self.listeners:
+                listener.enter(kind, start)
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                for listener in self.listeners:
+                    listener.exit(kind, start, self.current_token_index)
+        return wrapper
+    return decorator
+
+
 # Синтаксический анализатор
 class Parser:
-    def __init__(self, tokens, code_):
+    def __init__(self, tokens, code_, positions=None, listeners=None):
         self.tokens = tokens
         self.code = code_
+        self.positions = positions  # Смещения токенов в исходном коде (Lexer.positions)
+        self.listeners = listeners or []  # Слушатели событий разбора (ParseListener)
         self.pos = 0
         self.current_token_index = 0
         self.current_token = self.tokens[self.pos] if self.tokens else None
         self.has_errors = False  # Добавляем флаг наличия ошибок
         self.symbol_table = {}  # Таблица символов для хранения типов переменных
         self.ids = []
+        self.body_spans = []  # Границы операторов тела при lazy_body: смещения (начало, конец) в self.code
 
     def get_line_number(self):
         code_lines = self.code.splitlines()
@@ -146,52 +249,141 @@ class Parser:
                     f"Ожидалось {expected_value if expected_value else expected_type}, было получено {token}",
                     line_number, line_text)
 
-    def parse_program(self):
+    @emits("program")
+    def parse_program(self, lazy_body=False):
         try:
-            while self.get_token() and self.get_token()[0] == "COMMENT":
-                self.next_token()
-            # Ожидаем ключевое слово program
-            self.expect("KEYWORD", "program")
-            while self.get_token() and self.get_token()[0] == "COMMENT":
-                self.next_token()
+            self.parse_declarations()
+
+            # Начало основной программы
+            self.expect("KEYWORD", "begin")
 
-            # Проверка на наличие раздела var
-            if self.get_token() and self.get_token()[1] == "var":
-                self.expect("KEYWORD", "var")
+            # Парсинг основной программы
+            if lazy_body:
+                # Только запоминаем границы операторов, разбор - по запросу (parse_body_span)
+                self.skim_body()
+            else:
+                while self.get_token() and (self.get_token()[0] != "KEYWORD" or self.get_token()[1] != "end"):
+                    self.parse_statement()
 
-                # Парсинг идентификаторов в разделе var
-                while self.get_token() and self.get_token()[0] == "ID" or self.get_token()[0] == "COMMENT":
+                # Ожидаем end
+                self.expect("KEYWORD", "end")
+                self.expect("PUNCT", ".")
+                while self.get_token() and (self.get_token()[0] != "KEYWORD" or self.get_token()[1] != "end"):
                     if self.get_token()[0] == "COMMENT":
                         self.next_token()
                     else:
-                        self.parse_declaration()
-                    # if self.get_token() and self.get_token()[1] == ";": print(f"if {self.get_token()}")
-                    # self.next_token() else: print(f"else {self.get_token()}") print( f"Syntax error on line {
-                    # self.get_line_number()}: Expected ';' after declaration, but got {self.get_token()}") print(
-                    # f"Line content: {self.get_line_content()}") return
-                #  return
+                        self.has_errors = True
+                        raise SyntaxError("Обработка команд после end невозможна", 0, 0)
+                        break
 
-            # Начало основной программы
-            self.expect("KEYWORD", "begin")
+        except SyntaxError as e:
+            self.has_errors = True  # Устанавливаем флаг при ошибке
+            print(e)
 
-            # Парсинг основной программы
-            while self.get_token() and (self.get_token()[0] != "KEYWORD" or self.get_token()[1] != "end"):
-                self.parse_statement()
+    # Заголовок программы и раздел var (без тела begin ... end.)
+    @emits("declarations")
+    def parse_declarations(self):
+        while self.get_token() and self.get_token()[0] == "COMMENT":
+            self.next_token()
+        # Ожидаем ключевое слово program
+        self.expect("KEYWORD", "program")
+        while self.get_token() and self.get_token()[0] == "COMMENT":
+            self.next_token()
+
+        # Проверка на наличие раздела var
+        if self.get_token() and self.get_token()[1] == "var":
+            self.expect("KEYWORD", "var")
 
-            # Ожидаем end
-            self.expect("KEYWORD", "end")
-            self.expect("PUNCT", ".")
-            while self.get_token() and (self.get_token()[0] != "KEYWORD" or self.get_token()[1] != "end"):
+            # Парсинг идентификаторов в разделе var
+            while self.get_token() and self.get_token()[0] == "ID" or self.get_token()[0] == "COMMENT":
                 if self.get_token()[0] == "COMMENT":
                     self.next_token()
                 else:
-                    self.has_errors = True
-                    raise SyntaxError("Обработка команд после end невозможна", 0, 0)
-                    break
-
+                    self.parse_declaration()
+                # if self.get_token() and self.get_token()[1] == ";": print(f"if {self.get_token()}")
+                # self.next_token() else: print(f"else {self.get_token()}") print( f"Syntax error on line {
+                # self.get_line_number()}: Expected ';' after declaration, but got {self.get_token()}") print(
+                # f"Line content: {self.get_line_content()}") return
+            #  return
+
+    # Быстрый просмотр тела программы по исходному тексту: без лексического анализа и
+    # parse_statement, только по скобкам [ ] и символам ';' запоминаем границы операторов верхнего уровня
+    # (смещения в self.code). Токены тела при этом не нужны - см. Lexer.tokenize(stop_at_begin=True)
+    def skim_body(self):
+        if self.positions is None:
+            raise ValueError("Для lazy_body нужны смещения токенов (Lexer.positions)")
+        self.body_spans = []
+        code = self.code
+        start = self.positions[self.current_token_index - 1] + len("begin")
+        depth = 0
+        pending = None  # Конец оператора после ';', если следом не идет else
+        for match in SKIM_REGEX.finditer(code, start):
+            text = match.group(0)
+            if pending is not None:
+                if text == "else":
+                    # После then-ветки идет else - это тот же оператор if
+                    pending = None
+                    continue
+                self.add_body_span(start, pending)
+                start = pending
+                pending = None
+            if text == "[":
+                depth += 1
+            elif text == "]":
+                depth -= 1
+            elif depth > 0:
+                continue
+            elif text == ";":
+                pending = match.end(0)
+            elif text == "end":
+                # Оператор без завершающего ';' - ошибка обнаружится при разборе
+                self.add_body_span(start, match.start(0))
+                self.check_program_end(match.end(0))
+                return
+            elif text[0] == "{" and SKIP_REGEX.match(code, start).end(0) >= match.start(0):
+                # Комментарий между операторами - отдельный оператор (см. parse_comment)
+                self.add_body_span(match.start(0), match.end(0))
+                start = match.end(0)
+        raise SyntaxError("Ожидалось end, было получено None", 0, 0)
+
+    def add_body_span(self, start, end):
+        start = SPACE_REGEX.match(self.code, start).end(0)
+        if start < end:
+            self.body_spans.append((start, end))
+
+    # Проверка окончания программы после end (аналог проверки в parse_program)
+    def check_program_end(self, pos):
+        match = PROGRAM_END_REGEX.match(self.code, pos)
+        if not match:
+            raise SyntaxError("Ожидалось ., было получено None", 0, 0)
+        if SKIP_REGEX.match(self.code, match.end(0)).end(0) < len(self.code):
+            raise SyntaxError("Обработка команд после end невозможна", 0, 0)
+
+    # Разбор по запросу одного оператора, найденного skim_body: токены получаем только для этого оператора
+    def parse_body_span(self, index):
+        start, end = self.body_spans[index]
+        lexer = Lexer(self.code[start:end])
+        lexer.variables = set(self.symbol_table)
+        tokens = lexer.tokenize()
+        saved = (self.tokens, self.positions, self.current_token_index, self.current_token)
+        self.tokens = tokens
+        self.positions = [start + position for position in lexer.positions]
+        self.current_token_index = 0
+        self.current_token = tokens[0] if tokens else None
+        try:
+            self.parse_statement()
+            if self.current_token_index < len(tokens):
+                raise SyntaxError(f"Непредвиденное выражение {tokens[self.current_token_index][1]}",
+                                  self.get_line_number(), self.get_line_content())
+            if lexer.has_error:
+                self.has_errors = True
+            return not lexer.has_error
         except SyntaxError as e:
-            self.has_errors = True  # Устанавливаем флаг при ошибке
+            self.has_errors = True
             print(e)
+            return False
+        finally:
+            self.tokens, self.positions, self.current_token_index, self.current_token = saved
 
     # def parse_declaration(self):
     #     self.expect("ID")
@@ -203,6 +395,7 @@ class Parser:
     #     self.expect("PUNCT", ";")
 
     # Метод для парсинга объявлений переменных и их типов
+    @emits("declaration")
     def parse_declaration(self):
         # ids = []
         ids_n = []
@@ -239,6 +432,7 @@ class Parser:
         # print(self.symbol_table)
         self.expect("PUNCT", ";")
 
+    @emits("statement")
     def parse_statement(self, type_statement="None"):
         token = self.get_token()
         #print(token)
@@ -291,6 +485,7 @@ class Parser:
                 # print(token[0])
                 raise SyntaxError(f"Непредвиденное выражение {token[1]}", self.get_line_number(), self.get_line_content())
 
+    @emits("compound")
     def parse_compound_statement(self):
         self.expect("PUNCT", "[")
         #print("Still compound statement")
@@ -303,10 +498,11 @@ class Parser:
         self.expect("PUNCT", "]")
         self.expect("PUNCT", ";")
 
+    @emits("if")
     def parse_if_statement(self, type_of_statement="None"):
         self.expect("KEYWORD", "if")
         #print(type_of_statement+"type")
-        self.parse_expression()
+        self.parse_condition()
         # if type_of_statement == "compound":
         #     self.parse_expression()  # Парсим условие `if`
         # else:
@@ -331,9 +527,11 @@ class Parser:
             else:
                 self.parse_statement()
 
+    @emits("comment")
     def parse_comment(self):
         self.expect("COMMENT")
 
+    @emits("write")
     def parse_write_statement(self):
         self.expect("KEYWORD", "write")
         self.expect("PUNCT", "(")
@@ -346,21 +544,93 @@ class Parser:
         self.expect("PUNCT", ")")
         self.expect("PUNCT", ";")
 
-    def parse_expression(self, info="None"):
-        if info == "None":
-            # Парсим операнды и операторы
-            self.expect("ID", None)
-            while self.get_token() and self.get_token()[0] in ["OP_REL", "OP_ADD", "OP_MUL"]:
-                self.next_token()  # Пропускаем операцию
-                if self.expect("ID", None, True):
-                    self.expect("ID", None)
-                elif self.expect("INTEGER", None, True):
-                    self.expect("INTEGER", None)
-                elif self.expect("REAL", None, True):
-                    self.expect("REAL", None)
-                # self.expect("ID", None)
+    # Разбор выражения по приоритетам операций (таблица BINDING_POWER) за один проход без возвратов.
+    # Вместо рекурсии - явные стеки операндов и операций, поэтому вложенность скобок не ограничена.
+    # Возвращает тип выражения: "integer", "real", "boolean" или None, если тип неизвестен
+    @emits("expression")
+    def parse_expression(self):
+        types = []  # Стек типов операндов
+        operations = []  # Стек операций и открывающих скобок
+        depth = 0  # Число открытых скобок
+        while True:
+            # Префиксные ~ и открывающие скобки перед операндом
+            token = self.get_token()
+            while token and (token[0] == "OP_UNARY" or token[1] == "("):
+                if token[1] == "(":
+                    depth += 1
+                operations.append(token)
+                token = self.next_token()
+            types.append(self.parse_operand())
+
+            # Закрывающие скобки после операнда
+            token = self.get_token()
+            while token and token[1] == ")" and depth > 0:
+                self.reduce(types, operations, 0)
+                operations.pop()  # Открывающая скобка
+                depth -= 1
+                token = self.next_token()
+
+            power = BINDING_POWER.get(token[0]) if token else None
+            if power is None:
+                break
+            # Операции слева с тем же или большим приоритетом выполняются раньше (левая ассоциативность)
+            self.reduce(types, operations, power)
+            operations.append(token)
+            self.next_token()  # Пропускаем операцию
+        if depth > 0:
+            self.expect("PUNCT", ")")
+        self.reduce(types, operations, 0)
+        return types[0]
+
+    # Применение операций с вершины стека до открывающей скобки, связывающих не слабее power
+    def reduce(self, types, operations, power):
+        while operations and operations[-1][1] != "(":
+            operation = operations[-1]
+            if operation[0] == "OP_UNARY":
+                if UNARY_BINDING_POWER < power:
+                    break
+                operations.pop()
+                types.append(self.operation_type(operation, "boolean", types.pop()))
+            else:
+                if BINDING_POWER[operation[0]] < power:
+                    break
+                operations.pop()
+                right = types.pop()
+                types.append(self.operation_type(operation, types.pop(), right))
+
+    # Тип результата операции; операнды неизвестного типа (None) не проверяются
+    def operation_type(self, operation, left, right):
+        if operation[0] == "OP_UNARY" or operation[1] in ["and", "or"]:
+            expected = ["boolean"]
+        elif operation[0] == "OP_REL" and operation[1] in ["EQ", "NE"] and "boolean" in [left, right]:
+            expected = ["boolean"]
         else:
-            self.expect("INTEGER", None)
+            expected = NUMERIC_TYPES
+        if left is not None and left not in expected or right is not None and right not in expected:
+            raise SyntaxError(f"Неподходящий тип операнда для операции {operation[1]}", self.get_line_number(),
+                              self.get_line_content())
+        if operation[0] == "OP_REL" or expected == ["boolean"]:
+            return "boolean"
+        if left is None or right is None:
+            return None
+        return "real" if "real" in [left, right] else "integer"
+
+    # Условие if и while - выражение типа boolean
+    def parse_condition(self):
+        if self.parse_expression() not in ["boolean", None]:
+            raise SyntaxError("Условие должно иметь тип boolean", self.get_line_number(), self.get_line_content())
+
+    @emits("operand")
+    def parse_operand(self):
+        token = self.get_token()
+        if token and token[0] == "ID":
+            self.next_token()
+            return self.symbol_table.get(token[1])
+        if token and token[0] in OPERAND_TYPES:
+            self.next_token()
+            return OPERAND_TYPES[token[0]]
+        raise SyntaxError(f"Ожидался операнд выражения, было получено {token}", self.get_line_number(),
+                          self.get_line_content())
 
     # def parse_expression(self):
     #     # Проверка на допустимый токен: ID, INTEGER, REAL или BOOLEAN
@@ -387,6 +657,7 @@ class Parser:
     #                 line_text,
     #             )
 
+    @emits("read")
     def parse_read_statement(self):
         self.expect("KEYWORD", "read")
         self.expect("PUNCT", "(")
@@ -397,11 +668,15 @@ class Parser:
         self.expect("PUNCT", ")")
         self.expect("PUNCT", ";")
 
+    @emits("for")
     def parse_for_loop(self, type_of_statement="None"):
         self.expect("KEYWORD", "for")
         self.parse_assignment("for")  # Присваивание начального значения
         self.expect("KEYWORD", "to")
-        self.parse_expression("for")  # Парсим выражение конца диапазона
+        # Парсим выражение конца диапазона
+        if self.parse_expression() not in NUMERIC_TYPES + [None]:
+            raise SyntaxError("Граница цикла for должна быть числом", self.get_line_number(),
+                              self.get_line_content())
         self.expect("KEYWORD", "do")
         # self.parse_statement()  # Парсим оператор цикла
         # Проверяем, будет ли составной оператор
@@ -413,9 +688,10 @@ class Parser:
             else:
                 self.parse_statement()
 
+    @emits("while")
     def parse_while_loop(self, type_of_statement="None"):
         self.expect("KEYWORD", "while")
-        self.parse_expression()
+        self.parse_condition()
         # if type_of_statement == "compound":
         #     self.parse_expression("compound")  # Парсим выражение условия
         # else:
@@ -431,6 +707,7 @@ class Parser:
             else:
                 self.parse_statement()
 
+    @emits("assignment")
     def parse_assignment(self, info="None"):
         var_name = self.get_token()[1]
         var_type = self.symbol_table.get(var_name)
@@ -438,38 +715,16 @@ class Parser:
         self.expect("ID", None)
         self.expect("KEYWORD", "as")
 
-        # Проверка типа данных
-        if var_type == "integer":
-            #print(var_name)
-            #print(var_type)
-            #print(self.get_token())
-            if self.get_token()[0] == "INTEGER":
-                self.next_token()
-            elif self.get_token()[0] == "REAL" or self.get_token()[0] == "BOOLEAN":
-                raise SyntaxError(f"Неподходящий тип данных для переменной  '{var_name}'", self.get_line_number(),
-                                  self.get_line_content())
-            else:
-                self.parse_expression()
-        elif var_type == "real":
-            if self.get_token()[0] == "REAL" or self.get_token()[0] == "INTEGER":
-                self.next_token()
-            elif self.get_token()[0] == "BOOLEAN":
-                raise SyntaxError(f"Неподходящий тип данных для переменной  '{var_name}'", self.get_line_number(),
-                                  self.get_line_content())
-            else:
-                self.parse_expression()
-        elif var_type == "boolean":
-            if self.get_token()[0] == "BOOLEAN":
-                self.next_token()
-            elif self.get_token()[0] == "REAL" or self.get_token()[0] == "INTEGER":
-                raise SyntaxError(f"Неподходящий тип данных для переменной '{var_name}'", self.get_line_number(),
-                                  self.get_line_content())
-            else:
-                self.parse_expression()
-        else:
+        if var_type not in ["integer", "real", "boolean"]:
             raise SyntaxError(f"Неизвестный тип данных для переменной '{var_name}'", self.get_line_number(),
                               self.get_line_content())
 
+        # Проверка типа данных: тип всего выражения (integer можно присвоить переменной real)
+        value_type = self.parse_expression()
+        if value_type is not None and value_type != var_type and (var_type, value_type) != ("real", "integer"):
+            raise SyntaxError(f"Неподходящий тип данных для переменной  '{var_name}'", self.get_line_number(),
+                              self.get_line_content())
+
         if info == "None":
             # Завершаем инструкцию присваивания
             self.expect("PUNCT", ";")
@@ -613,16 +868,26 @@ def process_code(code, name="default"):
     lexer = Lexer(code)  # создаем лексер с исходным кодом
     tokens = lexer.tokenize()  # получаем токены
     # print(tokens)
-    parser = Parser(tokens, code)  # передаем токены и исходный код в парсер
+    parser = Parser(tokens, code, lexer.positions)  # передаем токены и исходный код в парсер
     parser.parse_program()  # запускаем синтаксический анализ
     # Проверяем наличие ошибок
     if not parser.has_errors and not lexer.has_error:
         print("Все верно")
 
 
-# Обработка каждого кода
-process_code(code, "program 0")
-process_code(code1, "program 1")
-process_code(code2, "program 2")
-process_code(code3, "program 3")
-process_code(code4, "program 4")
+# Только раздел объявлений: тело программы просматривается без полного разбора
+def process_declarations(code):
+    lexer = Lexer(code)
+    tokens = lexer.tokenize(stop_at_begin=True)
+    parser = Parser(tokens, code, lexer.positions)
+    parser.parse_program(lazy_body=True)
+    return parser
+
+
+if __name__ == "__main__":
+    # Обработка каждого кода
+    process_code(code, "program 0")
+    process_code(code1, "program 1")
+    process_code(code2, "program 2")
+    process_code(code3, "program 3")
+    process_code(code4, "program 4")
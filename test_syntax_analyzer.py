@@ -0,0 +1,125 @@
+import pytest
+
+from syntax_analyzer import (Lexer, MetricsListener, Parser, TreeBuilder, code2, code3, process_code,
+                             process_declarations)
+
+
+def parse(program, listeners=None):
+    lexer = Lexer(program)
+    parser = Parser(lexer.tokenize(), program, lexer.positions, listeners)
+    parser.parse_program()
+    return lexer, parser
+
+
+def test_lazy_body():
+    parser = process_declarations(code2)
+    assert parser.symbol_table == {"x": "integer", "y": "integer", "z": "real", "v": "boolean"}
+    assert len(parser.body_spans) == 7
+    start, end = parser.body_spans[4]
+    assert code2[start:end].startswith("if x LT y then") and code2[start:end].endswith("z as x min y;")
+    assert all(parser.parse_body_span(i) for i in range(len(parser.body_spans)))
+    assert not parser.has_errors
+    # Раздел var разобран, тело не разбивалось на токены
+    assert parser.tokens[-1] == ("KEYWORD", "begin")
+
+
+def test_lazy_body_after_end():
+    assert process_declarations(code3).has_errors  # команды после end.
+
+
+def test_parse_body_span_keeps_state():
+    # Оператор, разобранный не до конца, - ошибка без потери состояния парсера
+    parser = process_declarations("program var\nx : integer;\nbegin\nx as 1; else x as 2;\nend.\n")
+    state = (parser.tokens, parser.current_token_index, parser.current_token)
+    assert not parser.parse_body_span(0)
+    assert (parser.tokens, parser.current_token_index, parser.current_token) == state
+
+
+# Разбор программы с одним оператором в теле; True, если ошибок нет
+def is_valid(statement):
+    program = f"program var\nx, y : integer;\nz : real;\nb : boolean;\nbegin\n{statement}\nend.\n"
+    lexer, parser = parse(program)
+    return not parser.has_errors and not lexer.has_error
+
+
+@pytest.mark.parametrize("statement", [
+    # Константы любого вида, ~, скобки
+    "b as 5 LT 6;",
+    "b as ~(x GE 1FH) or ~~true;",
+    "z as (x plus 1.5) div (101B min 17O);",
+    "write(x plus 1, ~b, (y));",
+    # Приоритеты: OP_REL < OP_ADD < OP_MUL
+    "b as x plus y mult 2 LT 10;",
+    "b as ~b and (x LT 1);",
+    "z as x;",
+    # Условия и граница цикла
+    "if x LT y then x as 1;",
+    "while ~b or (z GT 1) do z as z min 1;",
+    "for x as 1 to y plus 2 do write(x);",
+    # Глубина скобок не ограничена стеком вызовов Python
+    "x as " + "(" * 5000 + "y" + ")" * 5000 + ";",
+])
+def test_valid_expressions(statement):
+    assert is_valid(statement)
+
+
+@pytest.mark.parametrize("statement", [
+    "x as 1 plus 2 mult 3 LT 4;",  # результат - boolean
+    "b as ~b and x LT 1;",  # (~b and x) LT 1
+    # Тип проверяется по всему выражению, а не по первому токену
+    "x as ~true;",
+    "b as 101B;",
+    "x as y plus 1.5;",
+    # Условия if/while - boolean, граница for - число
+    "while 1.5 do x as 1;",
+    "if x then x as 1;",
+    "for x as 1 to true do write(x);",
+    # Ошибки разбора
+    "x as (y;",
+    "x as y plus;",
+    "x as y);",
+])
+def test_invalid_expressions(statement):
+    assert not is_valid(statement)
+
+
+def test_listeners_share_pass():
+    metrics = MetricsListener()
+    tree = TreeBuilder()
+    parse(code2, [metrics, tree])
+    assert tree.root[:3] == ["program", 0, 84]
+    assert [node[0] for node in tree.root[3]][:3] == ["declarations", "statement", "statement"]
+    assert metrics.counts["while"] == metrics.counts["for"] == metrics.counts["if"] == 1
+    assert metrics.depth == 0 and not tree.stack
+
+
+def test_listeners_after_error():
+    # После синтаксической ошибки незавершенные конструкции тоже закрываются
+    metrics = MetricsListener()
+    tree = TreeBuilder()
+    lexer, parser = parse("program var\nx : integer;\nbegin\nx as ;\nend.\n", [metrics, tree])
+    assert parser.has_errors
+    assert metrics.depth == 0 and not tree.stack
+    node = tree.root
+    while node[3]:
+        node = node[3][-1]
+    assert node[0] == "operand" and tree.root[2] is not None
+
+
+def test_subclass_override_without_listeners():
+    class CommentCounter(Parser):
+        comments = 0
+
+        def parse_comment(self):
+            CommentCounter.comments += 1
+            super().parse_comment()
+
+    program = "program var\nx : integer;\nbegin\n{c}\nx as 1;\nend.\n"
+    lexer = Lexer(program)
+    CommentCounter(lexer.tokenize(), program).parse_program()
+    assert CommentCounter.comments == 1
+
+
+def test_process_code(capsys):
+    process_code(code2, "program 2")
+    assert capsys.readouterr().out == "Результат для program 2: \nВсе верно\n"